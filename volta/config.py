@@ -25,6 +25,18 @@ class Config:
     UPLOADS_DIR = Path.home() / "Downloads" / "volta" / "uploads"
     CSV_GLOB = str(UPLOADS_DIR / "*.csv")
 
+    # Parquet copies of the source data; rebuilds prefer these over CSVs.
+    PARQUET_GLOB = str(UPLOADS_DIR / "*.parquet")
+
+    # Parquet snapshot of the cleaned table, written on each rebuild;
+    # sorted and row-grouped so date-range scans can prune row groups.
+    PARQUET_EXPORT_PATH = str(Path(DUCKDB_PATH).parent / "sales_clean.parquet")
+
+    # DuckDB session tuning. Threads default to the machine's core count;
+    # the memory limit is left to DuckDB unless set (e.g. "2GB").
+    DUCKDB_THREADS = int(os.getenv("VOLTA_DUCKDB_THREADS", "0")) or None
+    DUCKDB_MEMORY_LIMIT = os.getenv("VOLTA_DUCKDB_MEMORY_LIMIT")
+
     # -------------------------
     # Data schema
     # -------------------------
@@ -55,7 +67,7 @@ class Config:
     RES_MAP = {"N-Resid [0]": "Commercial", "Resid [1]": "Residential"}
 
     # -------------------------
-    # Centralized metrics & frequency config
+    # Centralized metrics config
     # -------------------------
     METRICS: Dict[str, str] = {
         "kwh": "kWh",
@@ -63,11 +75,5 @@ class Config:
         "ghc": "GHC",
     }
 
-    FREQ_RULE: Dict[str, str] = {
-        "D": "D",
-        "W": "W-MON",  # weekly anchored to Monday
-        "M": "M",
-    }
-
 
 __all__ = ["Config"]
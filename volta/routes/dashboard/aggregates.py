@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-import pandas as pd
-from flask import current_app, jsonify, request
+from flask import current_app, request
+
+from volta.utils.json_response import json_response
 
 from . import bp, get_datastore, get_metrics
 from .helpers import build_params
@@ -11,22 +12,22 @@ from .helpers import build_params
 
 @bp.route("/pie-data", methods=["GET"])
 def pie_data():
+    """Metric share per segment, computed in DuckDB (fast)."""
     date_col = current_app.config["DATE_COL"]
     datastore = get_datastore()
     metrics = get_metrics()
     base = datastore.get(copy=False)
     params = build_params(request.args, base)
-    filtered = params.apply(base, date_col)
 
-    metric = metrics.validate(filtered, params.metric)
+    metric = metrics.validate(base, params.metric)
     segment_col = (
         "res_mapped"
-        if "res_mapped" in filtered.columns
-        else ("loc" if "loc" in filtered.columns else None)
+        if "res_mapped" in base.columns
+        else ("loc" if "loc" in base.columns else None)
     )
 
-    if not metric or segment_col is None or filtered.empty:
-        return jsonify(
+    if not metric or segment_col is None or base.empty:
+        return json_response(
             {
                 "labels": [],
                 "values": [],
@@ -35,11 +36,25 @@ def pie_data():
             }
         )
 
-    series = filtered.dropna(subset=[segment_col]).copy()
-    series[metric] = pd.to_numeric(series[metric], errors="coerce")
-    series = series.dropna(subset=[metric])
-    if series.empty:
-        return jsonify(
+    clause, sql_params = params.to_sql_where(
+        date_col=date_col,
+        available_columns=base.columns,
+        column_types=datastore.column_types("sales_clean"),
+    )
+
+    grp = datastore.run_query(
+        f"""
+        SELECT CAST({segment_col} AS VARCHAR) AS label, SUM({metric}) AS v
+        FROM prod.sales_clean
+        WHERE {clause} AND {segment_col} IS NOT NULL AND {metric} IS NOT NULL
+        GROUP BY 1
+        ORDER BY v DESC;
+        """,
+        sql_params,
+    )
+
+    if grp is None or grp.empty:
+        return json_response(
             {
                 "labels": [],
                 "values": [],
@@ -48,21 +63,16 @@ def pie_data():
             }
         )
 
-    grp = series.groupby(series[segment_col].astype(str))[metric].sum().sort_values(
-        ascending=False
-    )
-
     top_n = 8
     if len(grp) > top_n:
         top = grp.iloc[:top_n]
-        other_val = float(grp.iloc[top_n:].sum())
-        labels = top.index.tolist() + ["Other"]
-        values = [float(v) for v in top.values] + [other_val]
+        labels = [str(v) for v in top["label"]] + ["Other"]
+        values = [float(v) for v in top["v"]] + [float(grp["v"].iloc[top_n:].sum())]
     else:
-        labels = grp.index.tolist()
-        values = [float(v) for v in grp.values]
+        labels = [str(v) for v in grp["label"]]
+        values = [float(v) for v in grp["v"]]
 
-    return jsonify(
+    return json_response(
         {
             "labels": labels,
             "values": values,
@@ -74,18 +84,18 @@ def pie_data():
 
 @bp.route("/bar-data", methods=["GET"])
 def bar_data():
+    """Metric totals per city, computed in DuckDB (fast)."""
     date_col = current_app.config["DATE_COL"]
     datastore = get_datastore()
     metrics = get_metrics()
     base = datastore.get(copy=False)
     params = build_params(request.args, base)
-    filtered = params.apply(base, date_col)
 
-    metric = metrics.validate(filtered, params.metric)
+    metric = metrics.validate(base, params.metric)
     city_col = "loc"
 
-    if not metric or city_col not in filtered.columns or filtered.empty:
-        return jsonify(
+    if not metric or city_col not in base.columns or base.empty:
+        return json_response(
             {
                 "labels": [],
                 "values": [],
@@ -94,11 +104,25 @@ def bar_data():
             }
         )
 
-    series = filtered.dropna(subset=[city_col]).copy()
-    series[metric] = pd.to_numeric(series[metric], errors="coerce")
-    series = series.dropna(subset=[metric])
-    if series.empty:
-        return jsonify(
+    clause, sql_params = params.to_sql_where(
+        date_col=date_col,
+        available_columns=base.columns,
+        column_types=datastore.column_types("sales_clean"),
+    )
+
+    grp = datastore.run_query(
+        f"""
+        SELECT CAST({city_col} AS VARCHAR) AS label, SUM({metric}) AS v
+        FROM prod.sales_clean
+        WHERE {clause} AND {city_col} IS NOT NULL AND {metric} IS NOT NULL
+        GROUP BY 1
+        ORDER BY v DESC;
+        """,
+        sql_params,
+    )
+
+    if grp is None or grp.empty:
+        return json_response(
             {
                 "labels": [],
                 "values": [],
@@ -107,17 +131,13 @@ def bar_data():
             }
         )
 
-    grp = series.groupby(series[city_col].astype(str))[metric].sum().sort_values(
-        ascending=False
-    )
-
-    labels = grp.index.tolist()
-    values = [float(v) for v in grp.values]
-    return jsonify(
+    labels = [str(v) for v in grp["label"]]
+    values = [float(v) for v in grp["v"]]
+    return json_response(
         {
             "labels": labels,
             "values": values,
             "metric_label": metrics.label(metric),
             "segment": city_col,
         }
-    )
\ No newline at end of file
+    )
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
-from flask import current_app, jsonify, request
+from flask import current_app, request
+
+from volta.utils.json_response import json_response
 
 from . import bp, get_datastore, get_metrics
 from .helpers import build_params
@@ -23,13 +26,14 @@ def chart_data():
     validated_metrics = [m for m in requested_metrics if metrics.validate(base, m)]
 
     if not validated_metrics:
-        return jsonify(
+        return json_response(
             {"labels": [], "values": [], "metric_label": params.metric or "", "date_col": date_col}
         )
 
     clause, sql_params = params.to_sql_where(
         date_col=date_col,
         available_columns=base.columns,
+        column_types=datastore.column_types("sales_clean"),
     )
 
     trunc_unit = params.trunc_unit()
@@ -39,7 +43,7 @@ def chart_data():
         SELECT
           date_trunc('{trunc_unit}', {date_col}) AS bucket,
           {metric_sql}
-        FROM prod.sales
+        FROM prod.sales_clean
         WHERE {clause}
         GROUP BY 1
         ORDER BY 1;
@@ -48,7 +52,7 @@ def chart_data():
     df = datastore.run_query(sql, sql_params)
 
     if df is None or df.empty:
-        return jsonify(
+        return json_response(
             {
                 "labels": [],
                 "values": {m: [] for m in validated_metrics},
@@ -64,11 +68,11 @@ def chart_data():
 
     labels = [_fmt(v) for v in df["bucket"]]
 
-    values_dict = {}
-    for m in validated_metrics:
-        values_dict[m] = [float(v) if pd.notna(v) else 0.0 for v in df[m]]
+    values_dict = {
+        m: np.nan_to_num(df[m].to_numpy(dtype=float), nan=0.0) for m in validated_metrics
+    }
 
-    return jsonify(
+    return json_response(
         {
             "labels": labels,
             "values": values_dict,
@@ -19,7 +19,17 @@ def download_csv():
     base = datastore.get(copy=False)
 
     params = build_params(request.args, base)
-    filtered = params.apply(base, date_col)
+    try:
+        clause, sql_params = params.to_sql_where(
+            date_col=date_col,
+            available_columns=base.columns,
+            column_types=datastore.column_types("sales_clean"),
+        )
+        filtered = datastore.run_query(
+            f"SELECT * FROM prod.sales_clean WHERE {clause};", sql_params
+        )
+    except Exception:
+        filtered = params.apply(base, date_col)
 
     buf = io.StringIO()
     filtered.to_csv(buf, index=False)
@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 
 import pandas as pd
-from flask import current_app, jsonify, request
+from flask import current_app, request
 
 from . import bp, get_datastore
 from .helpers import DEFAULT_METERID_LIMIT, _parse_date
 from volta.utils.filter_params import FilterParams
+from volta.utils.json_response import json_response
 
 
 @bp.route("/filters/options", methods=["POST"])
@@ -17,7 +19,7 @@ def filter_options():
     datastore = get_datastore()
     base = datastore.get(copy=False)
     if base.empty:
-        return jsonify({"options": {}, "dates": {"min": "", "max": ""}, "rows": 0})
+        return json_response({"options": {}, "dates": {"min": "", "max": ""}, "rows": 0})
 
     payload = request.get_json(silent=True) or {}
 
@@ -54,25 +56,32 @@ def filter_options():
     )
 
     date_col = current_app.config["DATE_COL"]
-    clause, sql_params = params.to_sql_where(date_col=date_col, available_columns=base.columns)
+    clause, sql_params = params.to_sql_where(
+        date_col=date_col,
+        available_columns=base.columns,
+        column_types=datastore.column_types("sales_clean"),
+    )
 
     def distinct(col: str) -> List[str]:
-        df = datastore.run_query(
+        table = datastore.run_query_arrow(
             f"""
             SELECT DISTINCT CAST({col} AS VARCHAR) AS v
-            FROM prod.sales
+            FROM prod.sales_clean
             WHERE {clause} AND {col} IS NOT NULL
             ORDER BY v
             """,
             sql_params,
         )
-        if df is None or df.empty:
+        if table is None or table.num_rows == 0:
             return []
-        return df["v"].astype(str).tolist()
+        return table.column("v").to_pylist()
 
-    unique_values: Dict[str, List[str]] = {}
-    for col in facets:
-        unique_values[col] = distinct(col)
+    # Facet queries are independent; overlap the DuckDB scans.
+    if len(facets) > 1:
+        with ThreadPoolExecutor(max_workers=min(4, len(facets))) as ex:
+            unique_values: Dict[str, List[str]] = dict(zip(facets, ex.map(distinct, facets)))
+    else:
+        unique_values = {col: distinct(col) for col in facets}
 
     meter_cap = current_app.config.get("METERID_MAX_OPTIONS", DEFAULT_METERID_LIMIT)
     if "meterid" in unique_values:
@@ -83,7 +92,7 @@ def filter_options():
         SELECT
           MIN(CAST({date_col} AS DATE)) AS dmin,
           MAX(CAST({date_col} AS DATE)) AS dmax
-        FROM prod.sales
+        FROM prod.sales_clean
         WHERE {clause}
         """,
         sql_params,
@@ -96,12 +105,12 @@ def filter_options():
     )
 
     cdf = datastore.run_query(
-        f"SELECT COUNT(*) AS n FROM prod.sales WHERE {clause};",
+        f"SELECT COUNT(*) AS n FROM prod.sales_clean WHERE {clause};",
         sql_params,
     )
     rows = int(cdf.iloc[0]["n"]) if cdf is not None else 0
 
-    return jsonify(
+    return json_response(
         {
             "options": unique_values,
             "dates": {"min": date_min, "max": date_max},
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from datetime import date, datetime
+from datetime import date
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
@@ -13,14 +14,15 @@ from volta.utils.filter_params import FilterParams
 DEFAULT_METERID_LIMIT = 500
 
 
+@lru_cache(maxsize=1024)
 def _parse_date(value: str) -> Optional[date]:
+    """Parse an ISO date string at C speed; malformed input maps to None."""
     if not value:
         return None
     try:
-        return datetime.strptime(value, "%Y-%m-%d").date()
+        return date.fromisoformat(value)
     except ValueError:
-        parsed = pd.to_datetime(value, errors="coerce")
-        return parsed.date() if pd.notna(parsed) else None
+        return None
 
 
 def build_params(args, base_df: pd.DataFrame) -> FilterParams:
@@ -30,23 +32,13 @@ def build_params(args, base_df: pd.DataFrame) -> FilterParams:
 
     cols_lc = {str(c).lower(): c for c in base_df.columns}
 
-    for column in base_df.columns:
-        if column in exclude_cols:
+    # One walk over the MultiDict instead of an args.getlist per column.
+    for key, values in args.lists():
+        real_col = cols_lc.get(str(key).lower())
+        if not real_col or real_col in exclude_cols:
             continue
-        values = args.getlist(column)
-        if not values:
-            values = args.getlist(str(column).lower())
         if values:
-            selections[column] = [str(v) for v in values]
-
-    for key in args.keys():
-        if key in selections:
-            continue
-        real_col = cols_lc.get(str(key).lower())
-        if real_col and real_col not in exclude_cols:
-            vals = args.getlist(key)
-            if vals:
-                selections[real_col] = [str(v) for v in vals]
+            selections.setdefault(real_col, []).extend(str(v) for v in values)
 
     freq = (args.get("freq") or "D").upper()
     if freq not in ("D", "W", "M"):
@@ -63,13 +55,57 @@ def build_params(args, base_df: pd.DataFrame) -> FilterParams:
     )
 
 
-def build_unique_values(df: pd.DataFrame, max_uniques: int = 200) -> Dict[str, List[str]]:
+def build_unique_values(
+    df: pd.DataFrame,
+    max_uniques: int = 200,
+    datastore=None,
+    params: Optional[FilterParams] = None,
+) -> Dict[str, List[str]]:
+    """Distinct values per filterable column.
+
+    When a DuckDB-backed datastore and the request's ``FilterParams`` are
+    supplied, each list comes from a pushed-down ``SELECT DISTINCT`` over
+    ``prod.sales_clean`` instead of scanning the whole pandas frame; columns
+    missing from the table fall back to the pandas path.
+    """
     unique: Dict[str, List[str]] = {}
     exclude_cols = current_app.config["EXCLUDE_COLS"]
+
+    clause = sql_params = None
+    if datastore is not None and params is not None:
+        clause, sql_params = params.to_sql_where(
+            date_col=current_app.config["DATE_COL"],
+            available_columns=df.columns,
+            column_types=datastore.column_types("sales_clean"),
+        )
+
     for column in df.columns:
         if column in exclude_cols:
             continue
-        values = pd.Series(df[column].dropna().unique()).astype(str).tolist()
+        if clause is not None:
+            try:
+                unique[column] = (
+                    datastore.run_query_arrow(
+                        f"""
+                        SELECT DISTINCT CAST({column} AS VARCHAR) AS v
+                        FROM prod.sales_clean
+                        WHERE {clause} AND {column} IS NOT NULL
+                        ORDER BY v
+                        LIMIT {int(max_uniques)};
+                        """,
+                        sql_params,
+                    )
+                    .column("v")
+                    .to_pylist()
+                )
+                continue
+            except Exception:
+                pass
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            values = series.cat.categories.astype(str).tolist()
+        else:
+            values = pd.Series(series.dropna().unique()).astype(str).tolist()
         values = sorted(set(values))[:max_uniques]
         unique[column] = values
     return unique
@@ -79,25 +115,32 @@ def get_base_date_bounds(df: pd.DataFrame) -> Tuple[str, str]:
     date_col = current_app.config["DATE_COL"]
     if date_col not in df.columns or len(df) == 0:
         return "", ""
-    dmin = pd.to_datetime(df[date_col], errors="coerce").min()
-    dmax = pd.to_datetime(df[date_col], errors="coerce").max()
+    col = df[date_col]
+    if not pd.api.types.is_datetime64_any_dtype(col):
+        col = pd.to_datetime(col, errors="coerce")
+    dmin, dmax = col.min(), col.max()
     start = dmin.date().isoformat() if pd.notna(dmin) else ""
     end = dmax.date().isoformat() if pd.notna(dmax) else ""
     return start, end
 
 
-def no_filters_selected(args, base_df: pd.DataFrame) -> bool:
+def no_filters_selected(args, columns, datastore=None) -> bool:
+    """True when the request args would select the unfiltered dataset.
+
+    Needs only column names, so the caller can decide to redirect before
+    materializing any data; the date bounds come from the datastore's
+    cached metadata and are looked up only when dates were supplied.
+    """
     exclude_cols = current_app.config["EXCLUDE_COLS"]
-    any_checkbox = any(
-        args.getlist(column) for column in base_df.columns if column not in exclude_cols
-    )
+    selectable = frozenset(columns) - frozenset(exclude_cols)
+    any_checkbox = any(key in selectable and values for key, values in args.lists())
     if any_checkbox:
         return False
-    base_min, base_max = get_base_date_bounds(base_df)
     start_in = args.get("start_date", "")
     end_in = args.get("end_date", "")
     if not start_in and not end_in:
         return True
+    base_min, base_max = datastore.date_bounds() if datastore is not None else ("", "")
     if (start_in == base_min or not start_in) and (end_in == base_max or not end_in):
         return True
     return False
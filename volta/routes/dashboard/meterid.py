@@ -4,11 +4,12 @@ from __future__ import annotations
 
 from typing import Dict, List
 
-from flask import current_app, jsonify, request
+from flask import current_app, request
 
 from . import bp, get_datastore
 from .helpers import _parse_date
 from volta.utils.filter_params import FilterParams
+from volta.utils.json_response import json_response
 
 
 @bp.route("/options/meterid", methods=["GET", "POST"])
@@ -27,7 +28,7 @@ def options_meterid():
 
         base = datastore.get(copy=False)
         if base.empty or "meterid" not in base.columns:
-            return jsonify([])
+            return json_response([])
 
         raw_selections = payload.get("selections") or {}
         selections: Dict[str, List[str]] = {}
@@ -56,14 +57,14 @@ def options_meterid():
         date_col = current_app.config["DATE_COL"]
         filtered = params.apply(base, date_col)
         if filtered.empty or meterid_real not in filtered.columns:
-            return jsonify([])
+            return json_response([])
 
         series = filtered[meterid_real].dropna().astype(str)
         if q:
             series = series[series.str.contains(q, case=False, na=False)]
 
         unique_values = sorted(set(series.tolist()))
-        return jsonify(unique_values[:limit])
+        return json_response(unique_values[:limit])
 
     q = (request.args.get("q") or "").strip()
     loc = request.args.get("loc")
@@ -75,7 +76,7 @@ def options_meterid():
 
     sql = """
         SELECT DISTINCT meterid AS v
-        FROM prod.sales
+        FROM prod.sales_clean
         WHERE meterid IS NOT NULL
     """
     params = []
@@ -89,5 +90,5 @@ def options_meterid():
     sql += " ORDER BY v LIMIT ?"
     params.append(limit)
 
-    rows = datastore.run_query(sql, params)
-    return jsonify(rows["v"].astype(str).tolist())
\ No newline at end of file
+    rows = datastore.run_query_arrow(sql, params)
+    return json_response([str(v) for v in rows.column("v").to_pylist()])
\ No newline at end of file
@@ -2,46 +2,38 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
 import pandas as pd
 from flask import current_app, redirect, render_template, request, url_for
 
 from . import bp, get_datastore, get_metrics
 from .helpers import DEFAULT_METERID_LIMIT, build_params, build_unique_values, no_filters_selected
 
+# Rendered-payload cache: stable filter selections dominate real traffic,
+# so repeated URLs skip the filter/aggregate work entirely. Keys embed the
+# datastore version, so any rebuild/reload invalidates naturally.
+_PAYLOAD_CACHE: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+_PAYLOAD_CACHE_MAX = 128
 
-def index():
-    date_col = (
-        current_app.config()["DATE_COL"] if callable(current_app.config) else current_app.config["DATE_COL"]
-    )
-    datastore = get_datastore()
-    metrics = get_metrics()
-    base = datastore.get(copy=True)
-
-    if getattr(datastore, "_df", None) is None or base.empty:
-        return render_template("upload.html")
+# loc options vary only with the WHERE clause, which several distinct
+# payload keys (freq/metric tweaks) share.
+_LOC_CACHE: "OrderedDict[Tuple, list]" = OrderedDict()
+_LOC_CACHE_MAX = 64
 
-    if request.args and no_filters_selected(request.args, base):
-        return redirect(url_for("dashboard.index"))
 
+def _build_payload(datastore, metrics, base, date_col) -> Dict[str, Any]:
     params = build_params(request.args, base)
     after = params.apply(base, date_col)
 
-    unique_values = build_unique_values(after)
+    unique_values = build_unique_values(after, datastore=datastore, params=params)
 
     meter_cap = current_app.config.get("METERID_MAX_OPTIONS", DEFAULT_METERID_LIMIT)
 
     if "meterid" in base.columns:
         try:
-            meterids = datastore.run_query(
-                f"""
-                SELECT DISTINCT meterid AS v
-                FROM prod.sales
-                WHERE meterid IS NOT NULL
-                ORDER BY v
-                LIMIT {int(meter_cap)};
-                """
-            )["v"].astype(str).tolist()
-            unique_values["meterid"] = meterids
+            unique_values["meterid"] = datastore.meterid_options(int(meter_cap))
         except Exception:
             pass
 
@@ -50,55 +42,118 @@ def index():
             clause, sql_params = params.to_sql_where(
                 date_col=date_col,
                 available_columns=base.columns,
+                column_types=datastore.column_types("sales_clean"),
             )
 
-            locs = datastore.run_query(
-                f"""
-                SELECT DISTINCT CAST(loc AS VARCHAR) AS v
-                FROM prod.sales
-                WHERE {clause} AND loc IS NOT NULL
-                ORDER BY v;
-                """,
-                sql_params,
-            )["v"].astype(str).tolist()
+            loc_key = (datastore.version, clause, tuple(sql_params))
+            locs = _LOC_CACHE.get(loc_key)
+            if locs is None:
+                locs = datastore.run_query_arrow(
+                    f"""
+                    SELECT DISTINCT CAST(loc AS VARCHAR) AS v
+                    FROM prod.sales_clean
+                    WHERE {clause} AND loc IS NOT NULL
+                    ORDER BY v;
+                    """,
+                    sql_params,
+                ).column("v").to_pylist()
+                _LOC_CACHE[loc_key] = locs
+                if len(_LOC_CACHE) > _LOC_CACHE_MAX:
+                    _LOC_CACHE.popitem(last=False)
+            else:
+                _LOC_CACHE.move_to_end(loc_key)
             unique_values["loc"] = locs
         except Exception:
             pass
 
     start_value = end_value = ""
+    date_bounds = None
     if date_col in after.columns and len(after) > 0:
-        dmin = pd.to_datetime(after[date_col], errors="coerce").min()
-        dmax = pd.to_datetime(after[date_col], errors="coerce").max()
-        if pd.notna(dmin):
-            start_value = dmin.date().isoformat()
-        if pd.notna(dmax):
-            end_value = dmax.date().isoformat()
+        col = after[date_col]
+        if not pd.api.types.is_datetime64_any_dtype(col):
+            col = pd.to_datetime(col, errors="coerce")
+        date_bounds = (col.min(), col.max())
+        if pd.notna(date_bounds[0]):
+            start_value = date_bounds[0].date().isoformat()
+        if pd.notna(date_bounds[1]):
+            end_value = date_bounds[1].date().isoformat()
+
+    try:
+        stats = datastore.compute_stats_sql(params, base.columns)
+    except Exception:
+        stats = datastore.compute_stats(after)
+    try:
+        summary = datastore.compute_summary_sql(params, base.columns)
+    except Exception:
+        summary = datastore.compute_summary(after, date_bounds=date_bounds)
+
+    chart_metrics = datastore.chart_metric_keys or metrics.available(after)
+    default_metric = chart_metrics[0][0] if chart_metrics else ""
 
-    stats = datastore.compute_stats(after)
-    summary = datastore.compute_summary(after)
+    try:
+        clause, sql_params = params.to_sql_where(
+            date_col=date_col,
+            available_columns=base.columns,
+            column_types=datastore.column_types("sales_clean"),
+        )
+        preview = datastore.run_query(
+            f"SELECT * FROM prod.sales_clean WHERE {clause} LIMIT 10;", sql_params
+        )
+    except Exception:
+        preview = after.head(10)
+
+    return {
+        "date_col": date_col,
+        "stats": stats,
+        "summary": summary,
+        "start_value": start_value,
+        "end_value": end_value,
+        "unique_values": unique_values,
+        "total_rows": len(after),
+        "total_cols": len(after.columns),
+        "preview_cols": preview.columns.tolist(),
+        # One slab extraction; the template renders cells positionally.
+        "preview_rows": preview.to_numpy(dtype=object).tolist(),
+        "chart_metrics": chart_metrics,
+        "default_metric": default_metric,
+    }
 
-    chart_metrics = metrics.available(after)
-    default_metric = chart_metrics[0][0] if chart_metrics else ""
 
-    preview_html = after.head(10).to_html(
-        classes="table table-sm table-striped table-hover", index=False
+def index():
+    date_col = (
+        current_app.config()["DATE_COL"] if callable(current_app.config) else current_app.config["DATE_COL"]
     )
+    datastore = get_datastore()
+    metrics = get_metrics()
+
+    # Decide the empty-filter redirect from column metadata alone, before
+    # any data is materialized.
+    columns = datastore.columns()
+    if columns and request.args and no_filters_selected(request.args, columns, datastore):
+        return redirect(url_for("dashboard.index"))
+
+    base = datastore.get(copy=False)
 
-    return render_template(
-        "index.html",
-        date_col=date_col,
-        stats=stats,
-        summary=summary,
-        start_value=start_value,
-        end_value=end_value,
-        unique_values=unique_values,
-        args=request.args,
-        total_rows=len(after),
-        total_cols=len(after.columns),
-        preview_html=preview_html,
-        chart_metrics=chart_metrics,
-        default_metric=default_metric,
+    if getattr(datastore, "_df", None) is None or base.empty:
+        return render_template("upload.html")
+
+    if not columns and request.args and no_filters_selected(request.args, base.columns, datastore):
+        return redirect(url_for("dashboard.index"))
+
+    cache_key = (
+        getattr(datastore, "version", 0),
+        tuple(sorted(request.args.items(multi=True))),
     )
+    payload = _PAYLOAD_CACHE.get(cache_key)
+    if payload is None:
+        payload = _build_payload(datastore, metrics, base, date_col)
+        _PAYLOAD_CACHE[cache_key] = payload
+        if len(_PAYLOAD_CACHE) > _PAYLOAD_CACHE_MAX:
+            _PAYLOAD_CACHE.popitem(last=False)
+    else:
+        _PAYLOAD_CACHE.move_to_end(cache_key)
+
+    return render_template("index.html", args=request.args, **payload)
 
 
-bp.add_url_rule("/", view_func=index, methods=["GET"])
\ No newline at end of file
+bp.add_url_rule("/", view_func=index, methods=["GET"])
@@ -1,9 +1,9 @@
 from flask import Blueprint, request, render_template, redirect, url_for, current_app, Response
 import os
+import shutil
 from pathlib import Path
 from werkzeug.utils import secure_filename
 import logging
-import pandas as pd
 
 upload_bp = Blueprint("upload", __name__, template_folder="../../templates")
 
@@ -42,12 +42,13 @@ def upload_file():
             uploads_dir.mkdir(parents=True, exist_ok=True)
             filename = secure_filename(file.filename)
             filepath = uploads_dir / filename
-            file.save(str(filepath))
+            # Stream in 1 MB chunks rather than buffering the whole upload.
+            with open(filepath, "wb") as out:
+                shutil.copyfileobj(file.stream, out, length=1 << 20)
             logger.info("Saved upload to %s", filepath)
 
-            df = pd.read_csv(filepath)
             datastore = current_app.extensions["datastore"]
-            datastore.set_df(df) 
+            datastore.set_df_from_csv(str(filepath))
             logger.info("Uploaded CSV loaded into DataStore successfully")
 
             os.remove(filepath)
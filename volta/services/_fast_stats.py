@@ -0,0 +1,60 @@
+"""Single-pass nan-aware reductions for the pandas stats fallback.
+
+Used by :meth:`DataStore.compute_stats` when stats cannot be pushed into
+DuckDB. With numba installed the reduction is a compiled single sweep per
+column; without it a vectorized NumPy equivalent is used, so numba stays
+an optional dependency.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is optional
+    njit = None
+
+
+if njit is not None:
+
+    # No fastmath: its nnan assumption lets LLVM fold the np.isnan check
+    # away, silently breaking the NaN filtering this loop exists for.
+    @njit(cache=True)
+    def _sum_min_max_count(arr):
+        total = 0.0
+        vmin = np.inf
+        vmax = -np.inf
+        count = 0
+        for x in arr:
+            if not np.isnan(x):
+                total += x
+                if x < vmin:
+                    vmin = x
+                if x > vmax:
+                    vmax = x
+                count += 1
+        return total, vmin, vmax, count
+
+else:
+
+    def _sum_min_max_count(arr):
+        valid = arr[~np.isnan(arr)]
+        count = valid.size
+        if count == 0:
+            return 0.0, np.inf, -np.inf, 0
+        return float(valid.sum()), float(valid.min()), float(valid.max()), count
+
+
+def column_stats(arr: np.ndarray) -> Optional[Tuple[float, float, float, float, float]]:
+    """(sum, mean, median, min, max) of a float64 array, or None if empty."""
+    total, vmin, vmax, count = _sum_min_max_count(arr)
+    if count == 0:
+        return None
+    median = float(np.nanmedian(arr))
+    return float(total), float(total) / count, median, float(vmin), float(vmax)
+
+
+__all__ = ["column_stats"]
@@ -3,12 +3,16 @@
 from __future__ import annotations
 import logging
 import os
-from io import BytesIO
-from typing import Any, Dict, Mapping, Optional, Union
+import tempfile
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
 import duckdb
+import numpy as np
 import pandas as pd
 import requests
 
+from ._fast_stats import column_stats
+
 logger = logging.getLogger("volta")
 
 
@@ -20,11 +24,28 @@ class DataStore:
     - Materialized table: prod.sales
     """
 
+    _QUERY_CACHE_MAX = 128
+    # Results above this row count (full exports, big previews) are
+    # returned but not cached.
+    _QUERY_CACHE_MAX_ROWS = 10_000
+
     def __init__(self, config: Mapping[str, Any], metrics: "Metrics"):
         self.config = config
         self.metrics = metrics
         self._df: Optional[pd.DataFrame] = None
         self._con: Optional[duckdb.DuckDBPyConnection] = None
+        # Bumped whenever the underlying data changes; callers use it to
+        # key caches derived from this store.
+        self._version = 0
+        self._bounds: Optional[Tuple[str, str]] = None
+        self._bounds_version = -1
+        # (key, label) pairs of metric columns present and numeric in the
+        # loaded dataset; refreshed by _preprocess.
+        self.chart_metric_keys: list = []
+        self._meterid_options: Optional[Tuple[Tuple[int, int], list]] = None
+        self._session: Optional[requests.Session] = None
+        self._query_cache: "OrderedDict[Tuple, pd.DataFrame]" = OrderedDict()
+        self._column_types: Dict[Tuple[int, str], Dict[str, str]] = {}
 
     # ---------- DuckDB helpers ----------
 
@@ -32,21 +53,105 @@ class DataStore:
         if self._con is None:
             db_path = str(self.config.get("DUCKDB_PATH"))
             os.makedirs(os.path.dirname(db_path), exist_ok=True)
-            self._con = duckdb.connect(db_path)
+            con = duckdb.connect(db_path)
+            try:
+                # Session tuning: use all cores, cache parsed Parquet
+                # metadata, and skip order preservation (nothing relies on
+                # insertion order; GROUP BY/ORDER BY results are explicit).
+                threads = self.config.get("DUCKDB_THREADS") or os.cpu_count() or 1
+                con.execute(f"SET threads TO {int(threads)};")
+                mem = self.config.get("DUCKDB_MEMORY_LIMIT")
+                if mem:
+                    safe_mem = str(mem).replace("'", "''")
+                    con.execute(f"SET memory_limit='{safe_mem}';")
+                con.execute("SET preserve_insertion_order=false;")
+                con.execute("SET enable_object_cache=true;")
+            except Exception as e:
+                logger.warning("DuckDB session tuning failed: %s", e)
+            self._con = con
         return self._con
 
-    def _table_exists(self) -> bool:
+    def _table_exists(self, table: str = "sales") -> bool:
         con = self._connect()
         try:
             return bool(
                 con.execute(
                     "SELECT COUNT(*) FROM information_schema.tables "
-                    "WHERE table_schema='prod' AND table_name='sales';"
+                    "WHERE table_schema='prod' AND table_name=?;",
+                    [table],
                 ).fetchone()[0]
             )
         except Exception:
             return False
 
+    def _rebuild_clean(self) -> None:
+        """Materialize prod.sales_clean: dedup, res mapping, typed metrics.
+
+        Runs the same pipeline as :meth:`_preprocess` — drop duplicate and
+        incomplete rows, map ``res`` labels, coerce metric columns — but as
+        one DuckDB statement at rebuild time, so :meth:`load` gets typed
+        columns back without per-column pandas passes.
+        """
+        con = self._connect()
+        cols = [
+            r[0]
+            for r in con.execute(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_schema='prod' AND table_name='sales' "
+                "ORDER BY ordinal_position;"
+            ).fetchall()
+        ]
+        if not cols:
+            return
+
+        select_parts = []
+        for col in cols:
+            if col in self.metrics.mapping:
+                select_parts.append(f"TRY_CAST({col} AS DOUBLE) AS {col}")
+            else:
+                select_parts.append(col)
+
+        res_map = self.config.get("RES_MAP", {})
+        if "res" in cols and "res_mapped" not in cols and res_map:
+            cases = " ".join(
+                "WHEN '{}' THEN '{}'".format(
+                    str(k).replace("'", "''"), str(v).replace("'", "''")
+                )
+                for k, v in res_map.items()
+            )
+            select_parts.append(
+                f"CASE CAST(res AS VARCHAR) {cases} ELSE 'Unknown' END AS res_mapped"
+            )
+
+        not_null = " AND ".join(f"{c} IS NOT NULL" for c in cols)
+        con.execute(
+            f"""
+            CREATE OR REPLACE TABLE prod.sales_clean AS
+            SELECT DISTINCT {', '.join(select_parts)}
+            FROM prod.sales
+            WHERE {not_null};
+            """
+        )
+        con.execute("ANALYZE prod.sales_clean;")
+        logger.info("DuckDB table prod.sales_clean rebuilt.")
+
+        # Export a date-sorted, ZSTD/dictionary-encoded Parquet snapshot so
+        # cold loads and pushed-down scans can prune on row-group stats.
+        export_path = self.config.get("PARQUET_EXPORT_PATH")
+        if export_path:
+            date_col = self.config.get("DATE_COL", "chargedate")
+            order_by = f"ORDER BY {date_col}" if date_col in cols else ""
+            safe_export = str(export_path).replace("'", "''")
+            try:
+                con.execute(
+                    f"COPY (SELECT * FROM prod.sales_clean {order_by}) "
+                    f"TO '{safe_export}' "
+                    "(FORMAT PARQUET, COMPRESSION ZSTD, ROW_GROUP_SIZE 1000000);"
+                )
+                logger.info("Exported prod.sales_clean to %s", export_path)
+            except Exception as e:
+                logger.warning("Parquet export of prod.sales_clean failed: %s", e)
+
     def rebuild_from_csv(self) -> None:
         """Full rebuild of prod.sales from CSVs matched by CSV_GLOB."""
         con = self._connect()
@@ -65,47 +170,212 @@ class DataStore:
             #con.execute("CREATE TABLE prod.sales AS SELECT * FROM (SELECT 1 AS dummy) WHERE 1=0;")
         else:
             logger.info("Building prod.sales from %d CSV file(s): %s", len(files), csv_glob)
-            # Read CSVs, then normalize chargedate to DATE
-            con.execute(
-                f"""
-                CREATE TABLE prod.sales AS
-                WITH raw AS (
-                  SELECT * FROM read_csv_auto('{csv_glob}', HEADER=TRUE)
+            safe_glob = str(csv_glob).replace("'", "''")
+            safe_fmt = str(date_fmt).replace("'", "''")
+
+            # Sniff the header once and keep only domain columns, so the
+            # parser never converts text for columns nothing downstream
+            # reads. dateformat + an explicit DATE type parse the date
+            # column during ingestion, replacing the try_strptime post-pass.
+            # (read_csv cannot take its column list as a bound parameter,
+            # so identifiers are validated against the sniffed header and
+            # quoted instead.)
+            try:
+                header = [
+                    r[0]
+                    for r in con.execute(
+                        f"DESCRIBE SELECT * FROM read_csv_auto('{safe_glob}', HEADER=TRUE) LIMIT 0;"
+                    ).fetchall()
+                ]
+                wanted = set(self.metrics.mapping) | {date_col, "meterid", "loc", "res"}
+                keep = [c for c in header if c in wanted] or header
+                if date_col in keep:
+                    keep = [date_col] + [c for c in keep if c != date_col]
+                quoted = ", ".join('"{}"'.format(c.replace('"', '""')) for c in keep)
+                safe_date = str(date_col).replace("'", "''")
+                con.execute(
+                    f"""
+                    CREATE TABLE prod.sales AS
+                    SELECT {quoted}
+                    FROM read_csv('{safe_glob}', HEADER=TRUE,
+                                  dateformat='{safe_fmt}',
+                                  types={{'{safe_date}': 'DATE'}});
+                    """
+                )
+            except Exception as e:
+                logger.warning(
+                    "Pruned typed CSV read failed (%s); falling back to auto-detect.", e
+                )
+                con.execute("DROP TABLE IF EXISTS prod.sales;")
+                con.execute(
+                    f"""
+                    CREATE TABLE prod.sales AS
+                    WITH raw AS (
+                      SELECT * FROM read_csv_auto('{csv_glob}', HEADER=TRUE)
+                    )
+                    SELECT
+                      CAST(try_strptime({date_col}, '{date_fmt}') AS DATE) AS {date_col},
+                      * EXCLUDE ({date_col})
+                    FROM raw;
+                    """
                 )
-                SELECT
-                  CAST(try_strptime({date_col}, '{date_fmt}') AS DATE) AS {date_col},
-                  * EXCLUDE ({date_col})
-                FROM raw;
-                """
-            )
 
         con.execute("ANALYZE prod.sales;")
         logger.info("DuckDB table prod.sales rebuilt and analyzed.")
 
-        # Optional: helpful indexes
-        con.execute("CREATE INDEX IF NOT EXISTS idx_sales_country ON prod.sales(country);")
-        con.execute("CREATE INDEX IF NOT EXISTS idx_sales_category ON prod.sales(category);")
+        # Optional: helpful indexes, only for columns the ingest kept
+        # (queried directly: the version-keyed column_types cache may still
+        # describe the table this rebuild just replaced)
+        ingested = {
+            r[0]
+            for r in con.execute(
+                "SELECT column_name FROM information_schema.columns "
+                "WHERE table_schema='prod' AND table_name='sales';"
+            ).fetchall()
+        }
+        for col in ("country", "category"):
+            if col in ingested:
+                con.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_sales_{col} ON prod.sales({col});"
+                )
 
+        self._rebuild_clean()
         self._df = None
+        self._drop_feather_cache()
+        self._version += 1
+
+    def csv_to_parquet(self) -> Optional[str]:
+        """One-shot migration: bundle the CSV_GLOB files into one Parquet file.
+
+        Later rebuilds then take the Parquet path, which reads a fraction
+        of the bytes of re-parsing CSV text. Returns the output path, or
+        None when there is nothing to convert.
+        """
+        csv_glob = self.config.get("CSV_GLOB", "data/*.csv")
+        import glob as _glob
+        if not _glob.glob(csv_glob):
+            return None
+
+        out_path = os.path.join(os.path.dirname(csv_glob), "sales_raw.parquet")
+        safe_glob = str(csv_glob).replace("'", "''")
+        safe_out = str(out_path).replace("'", "''")
+        con = self._connect()
+        con.execute(
+            f"COPY (SELECT * FROM read_csv_auto('{safe_glob}', HEADER=TRUE)) "
+            f"TO '{safe_out}' "
+            "(FORMAT PARQUET, COMPRESSION ZSTD, ROW_GROUP_SIZE 122880);"
+        )
+        logger.info("Migrated CSVs matching %s to %s", csv_glob, out_path)
+        return out_path
+
+    def rebuild_from_parquet(self) -> bool:
+        """Rebuild prod.sales from Parquet files matched by PARQUET_GLOB.
+
+        Returns False when no files match so callers can fall back to the
+        CSV rebuild.
+        """
+        parquet_glob = self.config.get("PARQUET_GLOB") or os.path.join(
+            os.path.dirname(str(self.config.get("CSV_GLOB", "data/*.csv"))),
+            "*.parquet",
+        )
+        import glob as _glob
+        files = _glob.glob(parquet_glob)
+        if not files:
+            return False
+
+        date_col = self.config.get("DATE_COL", "chargedate")
+        date_fmt = self.config.get("DATE_FMT", "%d-%b-%y")
+        safe_glob = str(parquet_glob).replace("'", "''")
+
+        con = self._connect()
+        con.execute("CREATE SCHEMA IF NOT EXISTS prod;")
+        con.execute("DROP TABLE IF EXISTS prod.sales;")
+        logger.info(
+            "Building prod.sales from %d Parquet file(s): %s", len(files), parquet_glob
+        )
+        con.execute(
+            f"""
+            CREATE TABLE prod.sales AS
+            SELECT
+              COALESCE(
+                TRY_CAST({date_col} AS DATE),
+                CAST(try_strptime(CAST({date_col} AS VARCHAR), '{date_fmt}') AS DATE)
+              ) AS {date_col},
+              * EXCLUDE ({date_col})
+            FROM read_parquet('{safe_glob}');
+            """
+        )
+        con.execute("ANALYZE prod.sales;")
+        logger.info("DuckDB table prod.sales rebuilt from Parquet and analyzed.")
+
+        self._rebuild_clean()
+        self._df = None
+        self._drop_feather_cache()
+        self._version += 1
+        return True
 
     def run_query(self, sql: str, params=None) -> pd.DataFrame:
-        """Execute SQL on DuckDB and return as pandas DataFrame."""
+        """Execute SQL on DuckDB and return as pandas DataFrame.
+
+        Runs on a cursor so concurrent callers (e.g. parallel facet
+        queries) can share the single cached connection safely. Results
+        come back through Arrow rather than DuckDB's .df() path, which
+        avoids the BlockManager consolidation copy.
+
+        Results are memoized per (version, sql, params); the version key
+        means any rebuild/reload invalidates naturally. Callers treat the
+        returned frames as read-only.
+        """
+        key = (self._version, sql, tuple(params or ()))
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            self._query_cache.move_to_end(key)
+            return cached
+
+        con = self._connect()
+        df = self._arrow_to_pandas(
+            con.cursor().execute(sql, params or []).fetch_arrow_table()
+        )
+        # Only memoize small results; unbounded SELECT * frames (full CSV
+        # exports, distinct filter combinations) would otherwise pin up to
+        # _QUERY_CACHE_MAX full-table copies in memory.
+        if len(df) <= self._QUERY_CACHE_MAX_ROWS:
+            self._query_cache[key] = df
+            if len(self._query_cache) > self._QUERY_CACHE_MAX:
+                self._query_cache.popitem(last=False)
+        return df
+
+    def run_query_arrow(self, sql: str, params=None):
+        """Execute SQL on DuckDB and return the result as a pyarrow Table.
+
+        Skips the pandas round-trip for callers that only want plain
+        Python values (e.g. option lists via ``column(...).to_pylist()``).
+        """
         con = self._connect()
-        return con.execute(sql, params or []).df()
+        return con.cursor().execute(sql, params or []).fetch_arrow_table()
 
     def timeseries_daily(self, date_from, date_to, country=None, category=None) -> pd.DataFrame:
+        # Build the optional predicates only when set: a constant-folded
+        # `(? IS NULL OR col = ?)` still blocks filter pushdown, whereas a
+        # plain equality lets DuckDB prune on zone maps.
+        date_col = self.config.get("DATE_COL", "chargedate")
+        where = [f"{date_col} BETWEEN ? AND ?"]
+        params = [date_from, date_to]
+        if country is not None:
+            where.append("country = ?")
+            params.append(country)
+        if category is not None:
+            where.append("category = ?")
+            params.append(category)
         sql = f"""
         SELECT
-          date_trunc('day', {self.config.get("DATE_COL", "chargedate")}) AS day,
+          date_trunc('day', {date_col}) AS day,
           SUM(amount) AS total_amount
         FROM prod.sales
-        WHERE {self.config.get("DATE_COL", "chargedate")} BETWEEN ? AND ?
-          AND (? IS NULL OR country = ?)
-          AND (? IS NULL OR category = ?)
+        WHERE {' AND '.join(where)}
         GROUP BY 1
         ORDER BY 1;
         """
-        params = [date_from, date_to, country, country, category, category]
         return self.run_query(sql, params)
 
     def top_categories(self, date_from, date_to, limit=10) -> pd.DataFrame:
@@ -122,30 +392,55 @@ class DataStore:
         return self.run_query(sql, [date_from, date_to, limit])
 
     def table_page(self, date_from, date_to, country=None, limit=100, offset=0) -> pd.DataFrame:
+        date_col = self.config.get("DATE_COL", "chargedate")
+        where = [f"{date_col} BETWEEN ? AND ?"]
+        params: list = [date_from, date_to]
+        if country is not None:
+            where.append("country = ?")
+            params.append(country)
+        params.extend([limit, offset])
         sql = f"""
-        SELECT {self.config.get("DATE_COL", "chargedate")} AS chargedate,
+        SELECT {date_col} AS chargedate,
                country, category, amount
         FROM prod.sales
-        WHERE {self.config.get("DATE_COL", "chargedate")} BETWEEN ? AND ?
-          AND (? IS NULL OR country = ?)
-        ORDER BY {self.config.get("DATE_COL", "chargedate")} DESC
+        WHERE {' AND '.join(where)}
+        ORDER BY {date_col} DESC
         LIMIT ? OFFSET ?;
         """
-        params = [date_from, date_to, country, country, limit, offset]
         return self.run_query(sql, params)
 
     # ---------- Existing pandas compatibility ----------
 
     @staticmethod
-    def _clean_nan_rows(df: pd.DataFrame) -> pd.DataFrame:
-        return df.dropna(how="any").reset_index(drop=True)
+    def _arrow_to_pandas(table) -> pd.DataFrame:
+        """Arrow table -> pandas with Arrow-backed dtypes when available.
+
+        pd.ArrowDtype keeps strings dictionary-encodable and numerics
+        nullable without object fallbacks; older pandas gets the plain
+        NumPy-backed conversion. Temporal columns are left to the default
+        datetime64[ns] conversion: an Arrow-backed date column passes
+        is_datetime64_any_dtype but does not compare against pd.Timestamp
+        and returns datetime.date from .min()/.max(), which the filter and
+        view code is not written for.
+        """
+        if hasattr(pd, "ArrowDtype"):
+            import pyarrow as pa
 
-    def _preprocess(self, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.drop_duplicates().reset_index(drop=True)
-        df = self._clean_nan_rows(df)
+            def _mapper(arrow_type):
+                if pa.types.is_temporal(arrow_type):
+                    return None
+                return pd.ArrowDtype(arrow_type)
 
+            return table.to_pandas(
+                types_mapper=_mapper, split_blocks=True, self_destruct=True
+            )
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    def _preprocess(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Duplicate and incomplete rows are already removed by the
+        # DISTINCT / IS NOT NULL pass in _rebuild_clean.
         res_map = self.config.get("RES_MAP", {})
-        if "res" in df.columns and res_map:
+        if "res" in df.columns and "res_mapped" not in df.columns and res_map:
             df["res_mapped"] = df["res"].astype(str).map(res_map).fillna("Unknown")
 
         date_col = self.config.get("DATE_COL")
@@ -154,42 +449,213 @@ class DataStore:
             and date_col in df.columns
             and not pd.api.types.is_datetime64_any_dtype(df[date_col])
         ):
-            df[date_col] = pd.to_datetime(df[date_col], errors="coerce", format="%d-%b-%y")
-
-        for numcol in self.metrics.mapping.keys():
-            if numcol in df.columns:
-                df[numcol] = pd.to_numeric(df[numcol], errors="coerce")
+            # Billing dates repeat heavily: parse each distinct string once
+            # and broadcast via the factorized codes instead of running the
+            # strptime kernel over every row.
+            codes, uniques = df[date_col].factorize()
+            parsed = pd.to_datetime(uniques, errors="coerce", format="%d-%b-%y")
+            df[date_col] = parsed.take(codes, allow_fill=True, fill_value=pd.NaT)
+
+        # Metric columns loaded from sales_clean are already DOUBLE; only
+        # coerce the ones that actually arrive as text.
+        num_cols = [
+            c
+            for c in self.metrics.mapping
+            if c in df.columns and not pd.api.types.is_numeric_dtype(df[c])
+        ]
+        if num_cols:
+            df[num_cols] = df[num_cols].apply(pd.to_numeric, errors="coerce")
+
+        # Metric availability depends on schema, not on rows, so cache it
+        # here instead of re-deriving it from filtered frames per request.
+        self.chart_metric_keys = [
+            (k, self.metrics.mapping[k])
+            for k in self.metrics.mapping
+            if k in df.columns and pd.api.types.is_numeric_dtype(df[k])
+        ]
+
+        # Dictionary-encode low-cardinality strings; groupby/unique on the
+        # integer codes is far cheaper than on object-dtype columns. The
+        # hot filter columns are always encoded regardless of cardinality.
+        n_rows = len(df)
+        if n_rows:
+            force_categorical = ("meterid", "loc", "res")
+            for col in df.columns:
+                # Covers both object columns and Arrow-backed strings.
+                if not pd.api.types.is_string_dtype(df[col].dtype):
+                    continue
+                if col in force_categorical or df[col].nunique() / n_rows < 0.05:
+                    df[col] = df[col].astype("category")
 
         return df
 
     def _ensure_data(self) -> None:
-        if not self._table_exists():
-            logger.info("DuckDB table prod.sales missing; attempting to build from CSV.")
-            self.rebuild_from_csv()
+        if self._table_exists():
+            return
+        logger.info("DuckDB table prod.sales missing; attempting to build.")
+        if self.rebuild_from_parquet():
+            return
+        self.rebuild_from_csv()
+        try:
+            self.csv_to_parquet()
+        except Exception as e:
+            logger.warning("CSV-to-Parquet migration failed: %s", e)
+
+    def _http(self) -> requests.Session:
+        """Shared HTTP session: reuses the TCP/TLS connection across fetches
+        instead of re-handshaking per request."""
+        if self._session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            apikey = self.config.get("SUPABASE_KEY")
+            if apikey:
+                session.headers["apikey"] = apikey
+            self._session = session
+        return self._session
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self._con is not None:
+            self._con.close()
+            self._con = None
+
+    def _download_remote_parquet(self, url: str, timeout: int) -> str:
+        """Stream the remote parquet to a temp file; returns its path.
+
+        ``resp.content`` + ``BytesIO`` held the whole blob in memory while
+        pyarrow allocated the decoded table next to it; streaming in chunks
+        keeps peak memory at one copy. The caller owns the temp file.
+        """
+        with self._http().get(url, timeout=timeout, stream=True) as resp:
+            resp.raise_for_status()
+            with tempfile.NamedTemporaryFile(suffix=".parquet", delete=False) as tmp:
+                for chunk in resp.iter_content(chunk_size=1 << 20):
+                    tmp.write(chunk)
+                return tmp.name
+
+    def _ingest_remote_parquet(self, url: str, timeout: int) -> None:
+        """Download the remote parquet and load it into prod.sales in DuckDB.
+
+        DuckDB reads the file directly, so the raw data never takes the
+        detour through a pandas DataFrame and back.
+        """
+        tmp_path = self._download_remote_parquet(url, timeout)
+        try:
+            date_col = self.config.get("DATE_COL", "chargedate")
+            date_fmt = self.config.get("DATE_FMT", "%d-%b-%y")
+            safe_path = tmp_path.replace("'", "''")
+            con = self._connect()
+            con.execute("CREATE SCHEMA IF NOT EXISTS prod;")
+            con.execute(
+                f"""
+                CREATE OR REPLACE TABLE prod.sales AS
+                SELECT
+                  COALESCE(
+                    TRY_CAST({date_col} AS DATE),
+                    CAST(try_strptime(CAST({date_col} AS VARCHAR), '{date_fmt}') AS DATE)
+                  ) AS {date_col},
+                  * EXCLUDE ({date_col})
+                FROM read_parquet('{safe_path}');
+                """
+            )
+            con.execute("ANALYZE prod.sales;")
+        finally:
+            os.unlink(tmp_path)
+
+        self._rebuild_clean()
+        self._df = None
+        self._drop_feather_cache()
+        self._version += 1
+
+    # ---------- Feather warm-start cache ----------
+
+    def _feather_paths(self) -> Tuple[str, str]:
+        base = str(self.config.get("DUCKDB_PATH"))
+        return base + ".feather", base + ".feather.mtime"
+
+    def _load_feather_cache(self) -> Optional[pd.DataFrame]:
+        """Read the preprocessed frame back from the Arrow IPC snapshot.
+
+        Every in-process mutation path (rebuilds, ingests, set_df,
+        reload) drops the snapshot explicitly; the mtime sidecar only
+        guards against the database file changing between processes.
+        DuckDB rewrites can land in the WAL without touching the file's
+        mtime, so the sidecar alone is not a reliable invalidation signal.
+        """
+        feather_path, sidecar = self._feather_paths()
+        try:
+            if not (os.path.exists(feather_path) and os.path.exists(sidecar)):
+                return None
+            with open(sidecar) as f:
+                if f.read().strip() != repr(
+                    os.path.getmtime(str(self.config.get("DUCKDB_PATH")))
+                ):
+                    return None
+            import pyarrow as pa
+            with pa.memory_map(feather_path, "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+            return table.to_pandas(split_blocks=True)
+        except Exception as e:
+            logger.warning("Feather warm-start read failed: %s", e)
+            return None
+
+    def _write_feather_cache(self, df: pd.DataFrame) -> None:
+        feather_path, sidecar = self._feather_paths()
+        try:
+            import pyarrow as pa
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            with pa.OSFile(feather_path, "wb") as sink:
+                with pa.ipc.RecordBatchFileWriter(sink, table.schema) as writer:
+                    writer.write_table(table)
+            with open(sidecar, "w") as f:
+                f.write(repr(os.path.getmtime(str(self.config.get("DUCKDB_PATH")))))
+        except Exception as e:
+            logger.warning("Feather warm-start write failed: %s", e)
+
+    def _drop_feather_cache(self) -> None:
+        for path in self._feather_paths():
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
 
     def load(self):
         if self._df is not None:
             return self._df
 
+        cached = self._load_feather_cache()
+        if cached is not None:
+            logger.info("Loaded data from Feather warm-start cache.")
+            self._df = self._preprocess(cached)
+            return self._df
+
         con = self._connect()
         if self._table_exists():
             try:
-                raw = con.execute("SELECT * FROM prod.sales;").df()
-                logger.info("Loaded data from local DuckDB prod.sales.")
+                if not self._table_exists("sales_clean"):
+                    self._rebuild_clean()
+                raw = self._arrow_to_pandas(
+                    con.execute("SELECT * FROM prod.sales_clean;").fetch_arrow_table()
+                )
+                logger.info("Loaded data from local DuckDB prod.sales_clean.")
                 self._df = self._preprocess(raw)
+                self._write_feather_cache(self._df)
                 return self._df
             except Exception as e:
                 logger.warning("DuckDB table load failed: %s", e)
         url = self.config.get("BUCKET_URL")
-        headers = {"apikey": self.config.get("SUPABASE_KEY")}
         if url:
             try:
-                resp = requests.get(url, headers=headers, timeout=60)
-                resp.raise_for_status()
-                raw = pd.read_parquet(BytesIO(resp.content))
-                logger.info("Loaded remote parquet from BUCKET_URL.")
-                self.set_df(raw)
-                logger.info("Set and persisted remote data into DuckDB.")
+                self._ingest_remote_parquet(url, timeout=60)
+                logger.info("Ingested remote parquet from BUCKET_URL into DuckDB.")
+                raw = self._arrow_to_pandas(
+                    con.execute("SELECT * FROM prod.sales_clean;").fetch_arrow_table()
+                )
+                self._df = self._preprocess(raw)
                 return self._df
             except (requests.HTTPError, requests.ConnectionError, requests.Timeout) as e:
                 logger.error("Failed to fetch remote file from BUCKET_URL: %s", e)
@@ -200,24 +666,20 @@ class DataStore:
     
     def try_internet_connection(self) -> bool:
         url = self.config.get("BUCKET_URL")
-        headers = {"apikey": self.config.get("SUPABASE_KEY")}
         if not url:
             logger.warning("No BUCKET_URL configured.")
             return False
 
         try:
-            resp = requests.get(url, headers=headers, timeout=10)
-            resp.raise_for_status()
-            raw = pd.read_parquet(BytesIO(resp.content))
-            logger.info("Internet connection successful. Remote data fetched.")
-            self.set_df(raw)
+            self._ingest_remote_parquet(url, timeout=10)
+            logger.info("Internet connection successful. Remote data ingested.")
             return True
         except (requests.HTTPError, requests.ConnectionError, requests.Timeout) as e:
             logger.warning("Internet connection failed: %s", e)
             return False
 
     def set_df(self, df: pd.DataFrame) -> None:
-        self._df = self._preprocess(df)
+        df = self._preprocess(df)
         logger.info("DataStore loaded from uploaded file (in-memory).")
 
         date_col = self.config.get("DATE_COL", "chargedate")
@@ -225,7 +687,7 @@ class DataStore:
         con = self._connect()
         con.execute("CREATE SCHEMA IF NOT EXISTS prod;")
         con.execute("DROP TABLE IF EXISTS prod.sales;")
-        con.register("tmp_df", self._df)
+        con.register("tmp_df", df)
 
         # Ensure the persisted column is DATE (or TIMESTAMP) and drop the old one
         con.execute(f"""
@@ -238,6 +700,173 @@ class DataStore:
         con.unregister("tmp_df")
         con.execute("ANALYZE prod.sales;")
         logger.info("Persisted uploaded DataFrame into DuckDB prod.sales.")
+        self._rebuild_clean()
+        # Read the deduplicated table back so the cached frame matches it.
+        try:
+            self._df = self._preprocess(
+                self._arrow_to_pandas(
+                    con.execute("SELECT * FROM prod.sales_clean;").fetch_arrow_table()
+                )
+            )
+        except Exception:
+            self._df = df
+        self._drop_feather_cache()
+        self._version += 1
+
+    def columns(self) -> list:
+        """Column names of the current dataset without materializing rows."""
+        if self._df is not None:
+            return self._df.columns.tolist()
+        if self._table_exists("sales_clean"):
+            table = "sales_clean"
+        elif self._table_exists():
+            table = "sales"
+        else:
+            return []
+        rows = self._connect().cursor().execute(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema='prod' AND table_name=? "
+            "ORDER BY ordinal_position;",
+            [table],
+        ).fetchall()
+        return [r[0] for r in rows]
+
+    def column_types(self, table: str = "sales") -> Dict[str, str]:
+        """Cached {column: DuckDB data_type} map for prod.<table>.
+
+        Lets WHERE-clause builders skip redundant CASTs on columns that
+        already have the target type; cached per data version.
+        """
+        key = (self._version, table)
+        types = self._column_types.get(key)
+        if types is None:
+            try:
+                rows = self._connect().cursor().execute(
+                    "SELECT column_name, data_type FROM information_schema.columns "
+                    "WHERE table_schema='prod' AND table_name=?;",
+                    [table],
+                ).fetchall()
+            except Exception:
+                rows = []
+            types = dict(rows)
+            self._column_types = {key: types}
+        return types
+
+    def date_bounds(self) -> Tuple[str, str]:
+        """ISO (min, max) of the configured date column, cached per version."""
+        if self._bounds is not None and self._bounds_version == self._version:
+            return self._bounds
+        date_col = self.config.get("DATE_COL", "chargedate")
+        bounds = ("", "")
+        try:
+            table = "sales_clean" if self._table_exists("sales_clean") else "sales"
+            row = self._connect().cursor().execute(
+                f"SELECT MIN(CAST({date_col} AS DATE)) AS dmin, "
+                f"MAX(CAST({date_col} AS DATE)) AS dmax FROM prod.{table};"
+            ).fetchone()
+            if row and row[0] is not None:
+                bounds = (
+                    row[0].isoformat(),
+                    row[1].isoformat() if row[1] is not None else "",
+                )
+        except Exception:
+            pass
+        self._bounds = bounds
+        self._bounds_version = self._version
+        return bounds
+
+    def meterid_options(self, cap: int) -> list:
+        """Distinct meter IDs, unfiltered and capped; cached per data version.
+
+        The list does not depend on the request's filters, so one query per
+        rebuild serves every dashboard GET.
+        """
+        key = (self._version, int(cap))
+        if self._meterid_options is not None and self._meterid_options[0] == key:
+            return self._meterid_options[1]
+        values = [
+            str(v)
+            for v in self.run_query_arrow(
+                f"""
+                SELECT DISTINCT meterid AS v
+                FROM prod.sales_clean
+                WHERE meterid IS NOT NULL
+                ORDER BY v
+                LIMIT {int(cap)};
+                """
+            ).column("v").to_pylist()
+        ]
+        self._meterid_options = (key, values)
+        return values
+
+    @property
+    def version(self) -> int:
+        """Monotonic data version; changes on rebuild, upload, or reload."""
+        return self._version
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """(rows, cols) of the current dataset without forcing a load.
+
+        Before the frame is first materialized this falls back to table
+        metadata — a COUNT(*) over the cleaned table is index/metadata
+        work in DuckDB — so a warm restart still reports the real size.
+        """
+        df = self._df
+        if df is not None:
+            return (len(df), len(df.columns))
+        try:
+            if self._table_exists("sales_clean"):
+                table = "sales_clean"
+            elif self._table_exists():
+                table = "sales"
+            else:
+                return (0, 0)
+            rows = self._connect().cursor().execute(
+                f"SELECT COUNT(*) FROM prod.{table};"
+            ).fetchone()[0]
+            return (int(rows), len(self.column_types(table)))
+        except Exception:
+            return (0, 0)
+
+    def set_df_from_csv(self, path: str) -> None:
+        """Load an uploaded CSV straight into prod.sales via DuckDB.
+
+        DuckDB's parallel CSV reader writes directly into the column
+        store, skipping the pandas parse + register round-trip of
+        :meth:`set_df`. The cached frame is invalidated and rebuilt
+        lazily on the next :meth:`load`.
+        """
+        date_col = self.config.get("DATE_COL", "chargedate")
+        date_fmt = self.config.get("DATE_FMT", "%d-%b-%y")
+        safe_path = str(path).replace("'", "''")
+
+        con = self._connect()
+        con.execute("CREATE SCHEMA IF NOT EXISTS prod;")
+        con.execute("DROP TABLE IF EXISTS prod.sales;")
+        # COALESCE covers both a sniffed DATE column and raw strings.
+        con.execute(
+            f"""
+            CREATE TABLE prod.sales AS
+            WITH raw AS (
+              SELECT * FROM read_csv_auto('{safe_path}', HEADER=TRUE, sample_size=-1)
+            )
+            SELECT
+              COALESCE(
+                TRY_CAST({date_col} AS DATE),
+                CAST(try_strptime(CAST({date_col} AS VARCHAR), '{date_fmt}') AS DATE)
+              ) AS {date_col},
+              * EXCLUDE ({date_col})
+            FROM raw;
+            """
+        )
+        con.execute("ANALYZE prod.sales;")
+        logger.info("Uploaded CSV ingested into DuckDB prod.sales via read_csv_auto.")
+
+        self._rebuild_clean()
+        self._df = None
+        self._drop_feather_cache()
+        self._version += 1
 
     def get(self, copy: bool = True) -> pd.DataFrame:
         df = self.load()
@@ -245,25 +874,119 @@ class DataStore:
 
     def reload(self) -> None:
         self._df = None
+        self._version += 1
+        self._drop_feather_cache()
         logger.info("DataStore cache cleared")
 
     def compute_stats(self, df: pd.DataFrame) -> Dict[str, Dict[str, Union[float, str]]]:
         stats: Dict[str, Dict[str, Union[float, str]]] = {}
         for key, label in self.metrics.mapping.items():
             if key in df.columns:
-                s = pd.to_numeric(df[key], errors="coerce").dropna()
-                if len(s) > 0:
+                s = df[key]
+                if not pd.api.types.is_numeric_dtype(s):
+                    s = pd.to_numeric(s, errors="coerce")
+                arr = s.to_numpy(dtype=np.float64, na_value=np.nan)
+                result = column_stats(arr)
+                if result is not None:
+                    total, mean, median, vmin, vmax = result
                     stats[key] = {
                         "label": label,
-                        "sum": float(s.sum()),
-                        "mean": float(s.mean()),
-                        "median": float(s.median()),
-                        "min": float(s.min()),
-                        "max": float(s.max()),
+                        "sum": total,
+                        "mean": mean,
+                        "median": median,
+                        "min": vmin,
+                        "max": vmax,
                     }
         return stats
 
-    def compute_summary(self, df: pd.DataFrame) -> Dict[str, Union[int, str, None]]:
+    def compute_stats_sql(
+        self, params: "FilterParams", available_columns
+    ) -> Dict[str, Dict[str, Union[float, str]]]:
+        """Compute the per-metric aggregates in DuckDB in a single pass.
+
+        Mirrors :meth:`compute_stats`, but pushes the whole WHERE clause and
+        all sum/mean/median/min/max aggregates into one SQL statement so
+        only the metric columns are scanned, once.
+        """
+        available = set(available_columns)
+        keys = [k for k in self.metrics.mapping if k in available]
+        if not keys:
+            return {}
+
+        date_col = self.config.get("DATE_COL", "chargedate")
+        clause, sql_params = params.to_sql_where(
+            date_col=date_col,
+            available_columns=available,
+            column_types=self.column_types("sales_clean"),
+        )
+        select = ", ".join(
+            f"SUM({k}), AVG({k}), MEDIAN({k}), MIN({k}), MAX({k}), COUNT({k})"
+            for k in keys
+        )
+        con = self._connect()
+        row = con.cursor().execute(
+            f"SELECT {select} FROM prod.sales_clean WHERE {clause};", sql_params
+        ).fetchone()
+
+        stats: Dict[str, Dict[str, Union[float, str]]] = {}
+        for i, key in enumerate(keys):
+            total, mean, median, vmin, vmax, count = row[i * 6 : (i + 1) * 6]
+            if count:
+                stats[key] = {
+                    "label": self.metrics.mapping[key],
+                    "sum": float(total),
+                    "mean": float(mean),
+                    "median": float(median),
+                    "min": float(vmin),
+                    "max": float(vmax),
+                }
+        return stats
+
+    def compute_summary_sql(
+        self, params: "FilterParams", available_columns
+    ) -> Dict[str, Union[int, str, None]]:
+        """Compute the dashboard summary in one DuckDB scan.
+
+        Mirrors :meth:`compute_summary` — row/column counts, distinct
+        meters and locations, date bounds — without materializing the
+        filtered frame in pandas.
+        """
+        available = set(available_columns)
+        date_col = self.config.get("DATE_COL", "chargedate")
+        clause, sql_params = params.to_sql_where(
+            date_col=date_col,
+            available_columns=available,
+            column_types=self.column_types("sales_clean"),
+        )
+
+        selects = [
+            "COUNT(*)",
+            "COUNT(DISTINCT meterid)" if "meterid" in available else "NULL",
+            "COUNT(DISTINCT loc)" if "loc" in available else "NULL",
+        ]
+        if date_col in available:
+            selects.append(f"MIN(CAST({date_col} AS DATE))")
+            selects.append(f"MAX(CAST({date_col} AS DATE))")
+        else:
+            selects.extend(["NULL", "NULL"])
+
+        con = self._connect()
+        rows, meters, locs, dmin, dmax = con.cursor().execute(
+            f"SELECT {', '.join(selects)} FROM prod.sales_clean WHERE {clause};",
+            sql_params,
+        ).fetchone()
+        return {
+            "rows": int(rows),
+            "cols": len(available),
+            "meters": int(meters) if meters is not None else None,
+            "locations": int(locs) if locs is not None else None,
+            "date_min": dmin.isoformat() if dmin is not None else "",
+            "date_max": dmax.isoformat() if dmax is not None else "",
+        }
+
+    def compute_summary(
+        self, df: pd.DataFrame, date_bounds: Optional[Tuple[Any, Any]] = None
+    ) -> Dict[str, Union[int, str, None]]:
         date_col = self.config.get("DATE_COL")
         out: Dict[str, Union[int, str, None]] = {
             "rows": len(df),
@@ -274,12 +997,17 @@ class DataStore:
             "date_max": "",
         }
         if date_col and date_col in df.columns and len(df) > 0:
-            dmin = pd.to_datetime(df[date_col], errors="coerce").min()
-            dmax = pd.to_datetime(df[date_col], errors="coerce").max()
+            if date_bounds is not None:
+                dmin, dmax = date_bounds
+            else:
+                col = df[date_col]
+                if not pd.api.types.is_datetime64_any_dtype(col):
+                    col = pd.to_datetime(col, errors="coerce")
+                dmin, dmax = col.min(), col.max()
             if pd.notna(dmin):
-                out["date_min"] = dmin.date().isoformat()
+                out["date_min"] = pd.Timestamp(dmin).date().isoformat()
             if pd.notna(dmax):
-                out["date_max"] = dmax.date().isoformat()
+                out["date_max"] = pd.Timestamp(dmax).date().isoformat()
         return out
 
 
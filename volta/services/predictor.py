@@ -1,4 +1,5 @@
 import os
+import duckdb
 import joblib
 import numpy as np
 import pandas as pd
@@ -6,10 +7,65 @@ import pandas as pd
 # ---------------------------------
 # Feature preparation
 # ---------------------------------
+def _window_features_duckdb(df: pd.DataFrame) -> pd.DataFrame:
+    """Compute all lag and rolling features in one DuckDB window query.
+
+    One scan with LAG/AVG/STDDEV_SAMP window functions replaces nine
+    grouped shifts and twelve grouped rolling passes in pandas; the
+    COUNT(...) guards reproduce rolling's min_periods semantics. Rows
+    come back in input order via the rid tiebreak.
+    """
+    metric_cols = ["kwh", "ghc", "paymoney"]
+    src = df[["meterid", "chargedate"] + metric_cols].reset_index(drop=True)
+    src["rid"] = np.arange(len(src), dtype=np.int64)
+
+    exprs = []
+    for lag in [1, 2, 3]:
+        for col in metric_cols:
+            exprs.append(f"LAG({col}, {lag}) OVER w AS {col}_lag{lag}")
+    for col in metric_cols:
+        for window, min_periods in ((3, 2), (6, 3)):
+            w = f"w{window}"
+            exprs.append(
+                f"CASE WHEN COUNT({col}) OVER {w} >= {min_periods} "
+                f"THEN AVG({col}) OVER {w} END AS {col}_roll{window}_mean"
+            )
+            exprs.append(
+                f"CASE WHEN COUNT({col}) OVER {w} >= {min_periods} "
+                f"THEN STDDEV_SAMP({col}) OVER {w} END AS {col}_roll{window}_std"
+            )
+
+    con = duckdb.connect()
+    try:
+        con.register("feat_src", src)
+        out = con.execute(
+            f"""
+            SELECT {', '.join(exprs)}
+            FROM feat_src
+            WINDOW
+              w AS (PARTITION BY meterid ORDER BY chargedate, rid),
+              w3 AS (PARTITION BY meterid ORDER BY chargedate, rid
+                     ROWS BETWEEN 2 PRECEDING AND CURRENT ROW),
+              w6 AS (PARTITION BY meterid ORDER BY chargedate, rid
+                     ROWS BETWEEN 5 PRECEDING AND CURRENT ROW)
+            ORDER BY rid;
+            """
+        ).df()
+    finally:
+        con.close()
+    out.index = df.index
+    return out
+
+
+
 def _prepare_features(df: pd.DataFrame, as_of: str) -> pd.DataFrame:
-    df = df.copy()
-    df["chargedate"] = pd.to_datetime(df["chargedate"])
-    df = df[df["chargedate"] <= pd.to_datetime(as_of)].sort_values(["meterid", "chargedate"])
+    # Filter before copying so only rows up to `as_of` are ever duplicated;
+    # the full history frame is left untouched.
+    dates = pd.to_datetime(df["chargedate"])
+    mask = dates.le(pd.to_datetime(as_of)).to_numpy()
+    df = df.loc[mask].copy()
+    df["chargedate"] = dates.to_numpy()[mask]
+    df = df.sort_values(["meterid", "chargedate"])
 
     # basic temporal features
     df["month_num"] = df["chargedate"].dt.month
@@ -21,22 +77,28 @@ def _prepare_features(df: pd.DataFrame, as_of: str) -> pd.DataFrame:
     df["loc_enc"] = df["loc"].astype("category").cat.codes
     df["res_enc"] = df["res"].astype("category").cat.codes
 
-    # lag features
-    for lag in [1, 2, 3]:
-        for col in ["kwh", "ghc", "paymoney"]:
-            df[f"{col}_lag{lag}"] = df.groupby("meterid")[col].shift(lag)
-
-    # rolling means and stds
-    for col in ["kwh", "ghc", "paymoney"]:
-        df[f"{col}_roll3_mean"] = df.groupby("meterid")[col].transform(lambda x: x.rolling(3, min_periods=2).mean())
-        df[f"{col}_roll3_std"] = df.groupby("meterid")[col].transform(lambda x: x.rolling(3, min_periods=2).std())
-        df[f"{col}_roll6_mean"] = df.groupby("meterid")[col].transform(lambda x: x.rolling(6, min_periods=3).mean())
-        df[f"{col}_roll6_std"] = df.groupby("meterid")[col].transform(lambda x: x.rolling(6, min_periods=3).std())
-
-    # aggregate meter stats
-    prof = df.groupby("meterid")[["kwh", "ghc", "paymoney"]].agg(["mean", "std", "count"])
-    prof.columns = ["_".join(c) for c in prof.columns]
-    df = df.merge(prof, on="meterid", how="left")
+    metric_cols = ["kwh", "ghc", "paymoney"]
+    gb = df.groupby("meterid")
+
+    # lag and rolling features: one DuckDB window query when available,
+    # grouped pandas passes otherwise
+    try:
+        feats = _window_features_duckdb(df)
+        df[feats.columns.tolist()] = feats
+    except Exception:
+        for lag in [1, 2, 3]:
+            df[[f"{col}_lag{lag}" for col in metric_cols]] = gb[metric_cols].shift(lag)
+        for col in metric_cols:
+            for window, min_periods in ((3, 2), (6, 3)):
+                roll = gb[col].rolling(window, min_periods=min_periods)
+                df[f"{col}_roll{window}_mean"] = roll.mean().droplevel(0)
+                df[f"{col}_roll{window}_std"] = roll.std().droplevel(0)
+
+    # aggregate meter stats, broadcast with transform (no merge/re-index)
+    for col in metric_cols:
+        df[f"{col}_mean"] = gb[col].transform("mean")
+        df[f"{col}_std"] = gb[col].transform("std")
+        df[f"{col}_count"] = gb[col].transform("count")
 
     # deltas and ratios
     for col in ["kwh", "ghc", "paymoney"]:
@@ -51,36 +113,59 @@ def _prepare_features(df: pd.DataFrame, as_of: str) -> pd.DataFrame:
 
 
 # ---------------------------------
-# Model loading
+# Model loading and prediction
 # ---------------------------------
-def _load_models(models_dir: str) -> dict:
-    paths = {
-        "kwh_next": os.path.join(models_dir, "lgbm_final_kwh_next.pkl"),
-        "ghc_next": os.path.join(models_dir, "lgbm_final_ghc_next.pkl"),
-        "paymoney_next": os.path.join(models_dir, "lgbm_final_paymoney_next.pkl"),
-    }
-    return {t: joblib.load(p) for t, p in paths.items()}
-
+class Predictor:
+    """Load the next-month models once and reuse them across predictions.
 
-# ---------------------------------
-# Main prediction function
-# ---------------------------------
-def predict_next_month(df_raw: pd.DataFrame, models_dir: str, as_of: str) -> pd.DataFrame:
+    Models are memory-mapped so repeated loads of the same pickles share
+    pages instead of re-reading them from disk per call.
     """
-    Predict next-month [kwh, ghc, paymoney] for each meterid using data up to `as_of`.
-    Returns one row per meterid with *_next_pred columns.
-    """
-    df = _prepare_features(df_raw, as_of)
-    last_idx = df.groupby("meterid")["chargedate"].idxmax()
 
-    features = [c for c in df.columns if c not in ["meterid", "chargedate", "loc", "res"]]
-    X = df.loc[last_idx, features].copy()
-    meta = df.loc[last_idx, ["meterid", "chargedate"]].rename(columns={"chargedate": "as_of_month"}).reset_index(drop=True)
+    def __init__(self, models_dir: str):
+        self.models_dir = models_dir
+        self._models = None
+
+    def _load_models(self) -> dict:
+        if self._models is None:
+            paths = {
+                "kwh_next": os.path.join(self.models_dir, "lgbm_final_kwh_next.pkl"),
+                "ghc_next": os.path.join(self.models_dir, "lgbm_final_ghc_next.pkl"),
+                "paymoney_next": os.path.join(self.models_dir, "lgbm_final_paymoney_next.pkl"),
+            }
+            self._models = {t: joblib.load(p, mmap_mode="r") for t, p in paths.items()}
+        return self._models
+
+    def predict_next_month(self, df_raw: pd.DataFrame, as_of: str) -> pd.DataFrame:
+        """
+        Predict next-month [kwh, ghc, paymoney] for each meterid using data up to `as_of`.
+        Returns one row per meterid with *_next_pred columns.
+        """
+        df = _prepare_features(df_raw, as_of)
+        last_idx = df.groupby("meterid")["chargedate"].idxmax()
 
-    models = _load_models(models_dir)
-    out = meta.copy()
+        features = [c for c in df.columns if c not in ["meterid", "chargedate", "loc", "res"]]
+        # One contiguous float32 slab feeds all three models, instead of a
+        # per-model DataFrame-to-ndarray conversion inside predict().
+        Xnp = np.ascontiguousarray(df.loc[last_idx, features].to_numpy(dtype=np.float32))
+        meta = df.loc[last_idx, ["meterid", "chargedate"]].rename(columns={"chargedate": "as_of_month"}).reset_index(drop=True)
 
-    for target, model in models.items():
-        out[f"{target}_pred"] = model.predict(X)
+        models = self._load_models()
+        out = meta.copy()
 
-    return out.sort_values("meterid").reset_index(drop=True)
+        for target, model in models.items():
+            out[f"{target}_pred"] = model.predict(Xnp)
+
+        return out.sort_values("meterid").reset_index(drop=True)
+
+
+# One Predictor per models dir, so module-level callers also load once.
+_predictors: dict = {}
+
+
+def predict_next_month(df_raw: pd.DataFrame, models_dir: str, as_of: str) -> pd.DataFrame:
+    """Back-compat wrapper around :class:`Predictor`."""
+    predictor = _predictors.get(models_dir)
+    if predictor is None:
+        predictor = _predictors[models_dir] = Predictor(models_dir)
+    return predictor.predict_next_month(df_raw, as_of)
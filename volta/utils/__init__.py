@@ -4,5 +4,6 @@
 """Utility helpers for the Volta application."""
 
 from .filter_params import FilterParams
+from .json_response import json_response
 
-__all__ = ["FilterParams"]
\ No newline at end of file
+__all__ = ["FilterParams", "json_response"]
\ No newline at end of file
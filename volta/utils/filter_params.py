@@ -8,6 +8,7 @@ try:
 except ImportError:  # Python <3.8 w/o backport
     from typing_extensions import Literal
 
+import numpy as np
 import pandas as pd
 
 Freq = Literal["D", "W", "M"]  # daily, weekly, monthly
@@ -21,6 +22,17 @@ class FilterParams:
     freq: Freq = "D"
     metric: Optional[str] = None
 
+    def __hash__(self) -> int:
+        # The dataclass-generated hash trips over the selections dict;
+        # hash a canonical frozenset view instead so params can key
+        # caches (lru_cache, dict) directly.
+        sel = frozenset(
+            (col, tuple(sorted(vals)))
+            for col, vals in (self.selections or {}).items()
+            if vals
+        )
+        return hash((self.start, self.end, sel, self.freq, self.metric))
+
     # -------- pandas path --------
     def apply(self, df: pd.DataFrame, date_col: str) -> pd.DataFrame:
         """
@@ -32,8 +44,6 @@ class FilterParams:
 
         Handles dtype mismatches by comparing categorical columns as strings.
         """
-        out = df
-
         # Normalize all selection values to strings
         normalized: Dict[str, List[str]] = {
             col: [str(v) for v in vals if v not in (None, "")]
@@ -41,19 +51,32 @@ class FilterParams:
             if vals
         }
 
-        # Apply categorical filters
+        # Accumulate one combined boolean mask and take rows once at the
+        # end, instead of materializing an intermediate frame per filter.
+        mask = np.ones(len(df), dtype=bool)
+
         for col, vals in normalized.items():
-            if col in out.columns and vals:
-                out = out[out[col].astype(str).isin(vals)]
+            if col in df.columns and vals:
+                series = df[col]
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    # Compare on the integer codes instead of materializing
+                    # an object-dtype string column for every filter pass.
+                    wanted = series.cat.categories.astype(str).get_indexer(vals)
+                    wanted = wanted[wanted >= 0]
+                    mask &= np.isin(series.cat.codes.to_numpy(), wanted)
+                else:
+                    mask &= series.astype(str).isin(vals).to_numpy()
 
-        # Apply date range (inclusive)
-        if date_col in out.columns:
+        # Date range (inclusive)
+        if date_col in df.columns:
             if self.start is not None:
-                out = out[out[date_col] >= pd.Timestamp(self.start)]
+                mask &= (df[date_col] >= pd.Timestamp(self.start)).to_numpy()
             if self.end is not None:
-                out = out[out[date_col] <= pd.Timestamp(self.end)]
+                mask &= (df[date_col] <= pd.Timestamp(self.end)).to_numpy()
 
-        return out
+        if mask.all():
+            return df
+        return df.loc[mask]
 
     # -------- SQL helpers --------
     def trunc_unit(self) -> str:
@@ -64,6 +87,7 @@ class FilterParams:
         self,
         date_col: str,
         available_columns: Optional[Iterable[str]] = None,
+        column_types: Optional[Dict[str, str]] = None,
     ) -> Tuple[str, List[str]]:
         """
         Build a safe SQL WHERE clause and its parameters (DuckDB compatible).
@@ -73,22 +97,31 @@ class FilterParams:
           - categorical selections as IN-lists
 
         Robust to dtype mismatches by casting selected columns to VARCHAR.
+        When ``column_types`` (a {column: DuckDB data_type} map, e.g. from
+        DataStore.column_types) is given, columns that are already VARCHAR
+        or DATE are compared bare — CASTs wrap the column in an expression
+        that blocks zone-map/index pruning.
         """
+        types = column_types or {}
         where: List[str] = []
         params: List[str] = []
 
+        date_expr = (
+            date_col if types.get(date_col) == "DATE" else f"CAST({date_col} AS DATE)"
+        )
+
         # Date range (inclusive)
         if self.start is not None and self.end is not None:
-            where.append(f"CAST({date_col} AS DATE) BETWEEN ? AND ?")
+            where.append(f"{date_expr} BETWEEN ? AND ?")
             params.extend([
                 pd.Timestamp(self.start).date().isoformat(),
                 pd.Timestamp(self.end).date().isoformat(),
             ])
         elif self.start is not None:
-            where.append(f"CAST({date_col} AS DATE) >= ?")
+            where.append(f"{date_expr} >= ?")
             params.append(pd.Timestamp(self.start).date().isoformat())
         elif self.end is not None:
-            where.append(f"CAST({date_col} AS DATE) <= ?")
+            where.append(f"{date_expr} <= ?")
             params.append(pd.Timestamp(self.end).date().isoformat())
 
         cols = set(available_columns) if available_columns is not None else None
@@ -100,14 +133,16 @@ class FilterParams:
             if vals
         }
 
-        # Apply categorical selections (safe with CAST)
+        # Apply categorical selections (CAST only when the column isn't
+        # already text)
         for col, vals in normalized.items():
             if not vals:
                 continue
             if cols is not None and col not in cols:
                 continue
+            col_expr = col if types.get(col) == "VARCHAR" else f"CAST({col} AS VARCHAR)"
             placeholders = ",".join(["?"] * len(vals))
-            where.append(f"CAST({col} AS VARCHAR) IN ({placeholders})")
+            where.append(f"{col_expr} IN ({placeholders})")
             params.extend(vals)
 
         clause = " AND ".join(where) if where else "1=1"
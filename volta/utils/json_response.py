@@ -0,0 +1,24 @@
+"""Fast JSON responses for data-heavy endpoints."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from flask import Response
+
+
+def json_response(payload: Any) -> Response:
+    """Serialize ``payload`` with orjson and wrap it in a JSON response.
+
+    orjson encodes floats and numpy arrays natively (``OPT_SERIALIZE_NUMPY``),
+    so endpoints can hand over ndarrays directly instead of building Python
+    lists for ``jsonify``.
+    """
+    return Response(
+        orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY),
+        mimetype="application/json",
+    )
+
+
+__all__ = ["json_response"]